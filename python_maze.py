@@ -1,10 +1,22 @@
 import argparse
+import functools
+import heapq
+import itertools
+import os
 import random
+import struct
 import sys
+import threading
 from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import PurePath, Path
-from typing import Callable, List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict, Iterable, Sequence
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
 
 running_in_blender = "bpy" in sys.modules
 if not running_in_blender:
@@ -17,6 +29,10 @@ else:
 
 # random.seed(41)
 
+# Binary format: header, one opening mask byte per cell, then the path
+ENCODING_MAGIC = b"MAZE"
+ENCODING_VERSION = 1
+
 
 class Maze:
     class Cell:
@@ -49,6 +65,9 @@ class Maze:
         def connect(self, neighbor: int):
             self.links.add(neighbor)
 
+        def disconnect(self, neighbor: int):
+            self.links.discard(neighbor)
+
         def spatial(self, cell_id: int) -> Tuple[int, ...]:
             coordinates = []
             divisor = 1
@@ -63,6 +82,14 @@ class Maze:
                 and self.neighbors[direction] in self.links
             )
 
+        def opening_mask(self) -> int:
+            # One bit per direction, in "ewsnud" order (e = bit 0)
+            mask = 0
+            for bit, direction in enumerate("ewsnud"):
+                if self.has_link_in_direction(direction):
+                    mask |= 1 << bit
+            return mask
+
         def _coords_to_id(self, coords: List[int]) -> int:
             cell_id = 0
             multiplier = 1
@@ -113,6 +140,11 @@ class Maze:
             "u": 1,
             "d": 1,
         }
+        # BFS distance maps keyed by source cell, kept up to date by
+        # _add_links() / _remove_links() instead of being recomputed.
+        self._distance_cache: Dict[int, Dict[int, int]] = {}
+        self._distance_cache_size = 8
+        self._longest_path: Optional[List[int]] = None
 
     @property
     def silent(self) -> bool:
@@ -176,9 +208,27 @@ class Maze:
         return random.choice(neighbors)
 
     def _add_path_to_maze(self, path_to_add: List[int]):
-        for i in range(len(path_to_add) - 1):
-            self.get_cell(path_to_add[i]).connect(path_to_add[i + 1])
-            self.get_cell(path_to_add[i + 1]).connect(path_to_add[i])
+        self._add_links(zip(path_to_add, path_to_add[1:]))
+
+    def _add_links(self, pairs: Iterable[Tuple[int, int]]):
+        added = []
+        for a, b in pairs:
+            self.get_cell(a).connect(b)
+            self.get_cell(b).connect(a)
+            added.append((a, b))
+        self._longest_path = None
+        for distances in self._distance_cache.values():
+            self._relax_distances(distances, added)
+
+    def _remove_links(self, pairs: Iterable[Tuple[int, int]]):
+        removed = []
+        for a, b in pairs:
+            self.get_cell(a).disconnect(b)
+            self.get_cell(b).disconnect(a)
+            removed.append((a, b))
+        self._longest_path = None
+        for source, distances in self._distance_cache.items():
+            self._repair_distances(source, distances, removed)
 
     def get_cell(self, cell_id: int) -> Cell | None:
         if cell_id not in self.cells:
@@ -277,6 +327,302 @@ class Maze:
         else:
             self.out("No path found between dead ends.")
 
+    def distances_from(self, source: int) -> Dict[int, int]:
+        # Cached, and updated in place by braid() / regenerate_region():
+        # callers must not modify the returned dict.
+        if source in self._distance_cache:
+            return self._distance_cache[source]
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            current_cell = queue.popleft()
+            for neighbor_cell in self.get_cell(current_cell).links:
+                if neighbor_cell not in distances:
+                    distances[neighbor_cell] = distances[current_cell] + 1
+                    queue.append(neighbor_cell)
+        if len(self._distance_cache) >= self._distance_cache_size:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._distance_cache[next(iter(self._distance_cache))]
+        self._distance_cache[source] = distances
+        return distances
+
+    def longest_path(self) -> Optional[List[int]]:
+        # Double BFS sweep: exact on a perfect maze (diameter of the tree),
+        # an estimate once braided. Costs two BFS at most, none when both
+        # sweep sources are still in the distance cache.
+        if self._longest_path is None:
+            dead_end_cells = self.find_dead_ends()
+            if len(dead_end_cells) < 2:
+                return None
+            distances = self.distances_from(dead_end_cells[0])
+            first = max(dead_end_cells, key=lambda c: distances.get(c, -1))
+            distances = self.distances_from(first)
+            last = max(dead_end_cells, key=lambda c: distances.get(c, -1))
+            self._longest_path = self._path_from_distances(distances, last)
+        return self._longest_path
+
+    def _path_from_distances(
+        self, distances: Dict[int, int], end_cell: int
+    ) -> List[int]:
+        current_path = [end_cell]
+        while distances[current_path[-1]]:
+            current_cell = current_path[-1]
+            for neighbor_cell in self.get_cell(current_cell).links:
+                if distances.get(neighbor_cell) == distances[current_cell] - 1:
+                    current_path.append(neighbor_cell)
+                    break
+        current_path.reverse()
+        return current_path
+
+    def _relax_distances(self, distances: Dict[int, int], added: List[Tuple[int, int]]):
+        # New links can only shorten distances: propagate the decrease from
+        # the endpoints of the added links.
+        infinity = float("inf")
+        heap = []
+        for a, b in added:
+            for u, v in ((a, b), (b, a)):
+                if u in distances and distances[u] + 1 < distances.get(v, infinity):
+                    distances[v] = distances[u] + 1
+                    heapq.heappush(heap, (distances[v], v))
+        while heap:
+            distance, current_cell = heapq.heappop(heap)
+            if distance != distances[current_cell]:
+                continue
+            for neighbor_cell in self.get_cell(current_cell).links:
+                if distance + 1 < distances.get(neighbor_cell, infinity):
+                    distances[neighbor_cell] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbor_cell))
+
+    def _repair_distances(
+        self, source: int, distances: Dict[int, int], removed: List[Tuple[int, int]]
+    ):
+        # Find the cells that lost every shortest path to the source, in
+        # increasing distance order so supporters are settled first.
+        heap = []
+        for a, b in removed:
+            if a in distances and b in distances and distances[a] != distances[b]:
+                far = a if distances[a] > distances[b] else b
+                heapq.heappush(heap, (distances[far], far))
+        affected = set()
+        while heap:
+            distance, current_cell = heapq.heappop(heap)
+            if current_cell in affected or current_cell == source:
+                continue
+            links = self.get_cell(current_cell).links
+            if any(
+                distances.get(n) == distance - 1 and n not in affected for n in links
+            ):
+                continue
+            affected.add(current_cell)
+            for neighbor_cell in links:
+                if distances.get(neighbor_cell) == distance + 1:
+                    heapq.heappush(heap, (distance + 1, neighbor_cell))
+        if not affected:
+            return
+
+        # Recompute the affected cells from their unaffected neighbors;
+        # cells left without any are unreachable and dropped from the map.
+        for cell_id in affected:
+            del distances[cell_id]
+        heap = []
+        for cell_id in affected:
+            known = [
+                distances[n] + 1 for n in self.get_cell(cell_id).links if n in distances
+            ]
+            if known:
+                heapq.heappush(heap, (min(known), cell_id))
+        while heap:
+            distance, current_cell = heapq.heappop(heap)
+            if current_cell in distances:
+                continue
+            distances[current_cell] = distance
+            for neighbor_cell in self.get_cell(current_cell).links:
+                if neighbor_cell in affected and neighbor_cell not in distances:
+                    heapq.heappush(heap, (distance + 1, neighbor_cell))
+
+    def braid(self, fraction: float) -> int:
+        # Open walls of dead ends, preferring neighbors that are dead ends
+        # too. Creates loops: the maze is no longer perfect.
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"fraction must be between 0 and 1, got {fraction}")
+        dead_end_cells = self.find_dead_ends()
+        random.shuffle(dead_end_cells)
+        to_remove = round(len(dead_end_cells) * fraction)
+        # Links are applied in one batch at the end (one relax per cached
+        # distance map), so cells opened so far are tracked in `opened`.
+        opened = set()
+        pairs = []
+        removed = 0
+
+        def is_dead_end(_cell_id: int) -> bool:
+            return _cell_id not in opened and len(self.get_cell(_cell_id).links) == 1
+
+        for cell_id in dead_end_cells:
+            if removed >= to_remove:
+                break
+            if not is_dead_end(cell_id):
+                # Already opened while braiding a neighbor
+                continue
+            cell = self.get_cell(cell_id)
+            candidates = [n for n in cell.neighbors.values() if n not in cell.links]
+            if not candidates:
+                continue
+            dead_end_candidates = [n for n in candidates if is_dead_end(n)]
+            neighbor = random.choice(dead_end_candidates or candidates)
+            removed += 1 + is_dead_end(neighbor)
+            opened.update((cell_id, neighbor))
+            pairs.append((cell_id, neighbor))
+        self._add_links(pairs)
+        return removed
+
+    def regenerate_region(self, box_min: Sequence[int], box_max: Sequence[int]):
+        # box_min / box_max are inclusive coordinates. Only links between two
+        # cells of the box are re-rolled, so the maze stays a perfect maze.
+        if len(box_min) != len(self.dimensions_sizes) or len(box_max) != len(
+            self.dimensions_sizes
+        ):
+            raise ValueError(
+                "box_min and box_max must have one coordinate per dimension"
+            )
+        for low, high, size in zip(box_min, box_max, self.dimensions_sizes):
+            if not 0 <= low <= high < size:
+                raise ValueError(
+                    f"Invalid region {tuple(box_min)} - {tuple(box_max)} "
+                    f"for maze of size {tuple(self.dimensions_sizes)}"
+                )
+
+        region = set()
+        for coords in itertools.product(
+            *(range(low, high + 1) for low, high in zip(box_min, box_max))
+        ):
+            cell_id = 0
+            multiplier = 1
+            for coord, size in zip(coords, self.dimensions_sizes):
+                cell_id += coord * multiplier
+                multiplier *= size
+            region.add(cell_id)
+
+        self._remove_links(
+            (cell_id, neighbor_id)
+            for cell_id in region
+            for neighbor_id in list(self.get_cell(cell_id).links)
+            if neighbor_id in region and cell_id < neighbor_id
+        )
+
+        # Label the region cells by the piece of maze they now belong to:
+        # two cells of the same piece are still connected through the outside.
+        component = {}
+        members: Dict[int, List[int]] = {}
+        for cell_id in region:
+            if cell_id in component:
+                continue
+            members[cell_id] = []
+            queue = deque([cell_id])
+            visited = {cell_id}
+            while queue:
+                current_cell = queue.popleft()
+                if current_cell in region:
+                    component[current_cell] = cell_id
+                    members[cell_id].append(current_cell)
+                for neighbor_cell in self.get_cell(current_cell).links:
+                    if neighbor_cell not in visited:
+                        visited.add(neighbor_cell)
+                        queue.append(neighbor_cell)
+
+        # The walks only read the piece labels, so their links are applied
+        # in one batch at the end (one relax per cached distance map).
+        in_tree = {component[random.choice(list(region))]}
+        unvisited = {c for c in region if component[c] not in in_tree}
+        all_crossings = []
+        while unvisited:
+            cell = random.choice(list(unvisited))
+            crossings, path_components = self._region_walk(
+                cell, region, component, in_tree
+            )
+            all_crossings.extend(crossings)
+            for label in path_components:
+                in_tree.add(label)
+                unvisited.difference_update(members[label])
+        self._add_links(all_crossings)
+
+    def _region_walk(
+        self,
+        start_cell: int,
+        region: set[int],
+        component: Dict[int, int],
+        in_tree: set[int],
+    ) -> Tuple[List[Tuple[int, int]], List[int]]:
+        # Loop-erased walk over the pieces of maze rather than over cells:
+        # entering a piece already on the path erases the loop, and moving
+        # inside a piece adds no link. crossings[i] is the wall crossed to
+        # enter path_components[i + 1].
+        current_cell = start_cell
+        last_steps = [start_cell]
+        path_components = [component[start_cell]]
+        crossings = []
+        while path_components[-1] not in in_tree:
+            neighbors = [
+                n for n in self.get_cell(current_cell).neighbors.values() if n in region
+            ]
+            next_cell = self._choose_next_cell(last_steps, neighbors)
+            next_component = component[next_cell]
+            if next_component in path_components:
+                index = path_components.index(next_component)
+                path_components = path_components[: index + 1]
+                crossings = crossings[:index]
+            else:
+                crossings.append((current_cell, next_cell))
+                path_components.append(next_component)
+            last_steps = [current_cell, next_cell]
+            current_cell = next_cell
+        return crossings, path_components
+
+    def encode(self, path: Optional[List[int]] = None) -> bytes:
+        header = struct.pack(
+            f"<4sBB{len(self.dimensions_sizes)}I",
+            ENCODING_MAGIC,
+            ENCODING_VERSION,
+            len(self.dimensions_sizes),
+            *self.dimensions_sizes,
+        )
+        masks = bytes(
+            self.get_cell(cell_id).opening_mask() for cell_id in range(self.total_cells)
+        )
+        path = path or []
+        return header + masks + struct.pack(f"<I{len(path)}I", len(path), *path)
+
+    @classmethod
+    def decode(cls, data: bytes, **kwargs) -> Tuple["Maze", List[int]]:
+        offset = struct.calcsize("<4sBB")
+        if len(data) < offset:
+            raise ValueError("Truncated maze data (header)")
+        magic, version, dimensions = struct.unpack_from("<4sBB", data)
+        if magic != ENCODING_MAGIC or version != ENCODING_VERSION:
+            raise ValueError("Not an encoded maze (or unsupported version)")
+        if len(data) < offset + 4 * dimensions:
+            raise ValueError("Truncated maze data (sizes)")
+        sizes = list(struct.unpack_from(f"<{dimensions}I", data, offset))
+        offset += 4 * dimensions
+        maze = cls(sizes=sizes, **kwargs)
+        if len(data) < offset + maze.total_cells + 4:
+            raise ValueError("Truncated maze data (cells)")
+        masks = data[offset : offset + maze.total_cells]
+        offset += maze.total_cells
+        (path_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        if len(data) != offset + 4 * path_length:
+            raise ValueError(
+                f"Invalid maze data length: {len(data)} bytes, "
+                f"expected {offset + 4 * path_length}"
+            )
+        for cell_id, mask in enumerate(masks):
+            cell = maze.get_cell(cell_id)
+            for bit, direction in enumerate("ewsnud"):
+                if mask & (1 << bit) and direction in cell.valid_directions:
+                    cell.connect(cell.neighbors[direction])
+        path = list(struct.unpack_from(f"<{path_length}I", data, offset))
+        return maze, path
+
     def _out_verbose(self, content):
         if self._output_file:
             with open(self._output_file, "a") as file:
@@ -360,6 +706,245 @@ class Maze:
         self.out("\n")
 
 
+def parse_profile(text: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    # "XxYxZ" optionally followed by direction weights: "20x20x3:e=2,u=0.5"
+    sizes_text, _, weights_text = text.partition(":")
+    try:
+        sizes = tuple(int(size) for size in sizes_text.split("x"))
+    except ValueError:
+        raise ValueError(f"Invalid sizes in profile {text!r}")
+    if len(sizes) != 3 or min(sizes) < 1:
+        raise ValueError(f"Profile {text!r} needs three positive sizes")
+    weights = dict.fromkeys("ewsnud", 1.0)
+    for item in filter(None, weights_text.split(",")):
+        direction, _, value = item.partition("=")
+        if direction not in weights:
+            raise ValueError(f"Unknown direction {direction!r} in profile {text!r}")
+        weights[direction] = float(value)
+    return sizes, tuple(weights.values())
+
+
+def generate_encoded(sizes: Tuple[int, ...], weights: Tuple[float, ...]) -> bytes:
+    maze = Maze(
+        sizes=list(sizes),
+        silent=True,
+        direction_weights=dict(zip("ewsnud", weights)),
+    )
+    maze.generate()
+    return maze.encode(maze.longest_path())
+
+
+class MazePool:
+    # Keeps `stock` encoded mazes ready per profile, generated by warm
+    # worker processes and refilled after each hand-out.
+    def __init__(self, profiles: List[Tuple], stock: int, workers: int):
+        self._workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._stock = stock
+        # Reentrant: a done callback can run right away in the thread that
+        # registers it, while _refill() still holds the lock.
+        self._lock = threading.RLock()
+        self._ready: Dict[Tuple, deque] = {profile: deque() for profile in profiles}
+        # Futures still being generated, oldest first. take() may claim one:
+        # a future no longer listed here is not added to the ready stock.
+        self._pending: Dict[Tuple, deque] = {profile: deque() for profile in profiles}
+        self._closed = False
+        for profile in profiles:
+            self._refill(profile)
+
+    @property
+    def profiles(self) -> List[Tuple]:
+        return list(self._ready)
+
+    def available(self, profile: Tuple) -> int:
+        with self._lock:
+            return len(self._ready[profile])
+
+    def take(self, profile: Tuple) -> bytes:
+        with self._lock:
+            ready = self._ready[profile]
+            pending = self._pending[profile]
+            data = ready.popleft() if ready else None
+            future = pending.popleft() if data is None and pending else None
+            self._refill(profile)
+        if data is None and future is not None:
+            # Pool drained: wait for the oldest refill, already in a worker
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Maze generation failed: {e}", file=sys.stderr)
+        if data is None:
+            data = self._generate_locally(profile)
+        return data
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _generate_locally(self, profile: Tuple) -> bytes:
+        # Last resort, nothing pending in the workers: this holds the GIL
+        # and slows down every other request thread.
+        return generate_encoded(*profile)
+
+    def _refill(self, profile: Tuple):
+        with self._lock:
+            if self._closed:
+                return
+            pending = self._pending[profile]
+            missing = self._stock - len(self._ready[profile]) - len(pending)
+            for _ in range(missing):
+                try:
+                    future = self._submit(profile)
+                except BrokenProcessPool as e:
+                    print(f"Cannot refill maze pool: {e}", file=sys.stderr)
+                    return
+                pending.append(future)
+                future.add_done_callback(functools.partial(self._on_done, profile))
+
+    def _submit(self, profile: Tuple) -> Future:
+        try:
+            return self._executor.submit(generate_encoded, *profile)
+        except BrokenProcessPool:
+            # A worker died (OOM, killed...): start a fresh set of workers
+            print("Maze worker died, restarting the workers", file=sys.stderr)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            return self._executor.submit(generate_encoded, *profile)
+
+    def _on_done(self, profile: Tuple, future: Future):
+        with self._lock:
+            pending = self._pending[profile]
+            if future not in pending:
+                # Claimed by take(), which reads the result itself
+                return
+            pending.remove(future)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"Maze generation failed: {future.exception()}", file=sys.stderr)
+                self._refill(profile)
+                return
+            self._ready[profile].append(future.result())
+
+
+class MazeRequestHandler(BaseHTTPRequestHandler):
+    # GET /maze?profile=20x20x3:e=2 -> application/octet-stream (Maze.encode)
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/maze":
+            self.send_error(404)
+            return
+        profile_text = parse_qs(url.query).get("profile", [""])[0]
+        try:
+            profile = parse_profile(profile_text)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        if profile not in self.server.pool.profiles:
+            self.send_error(404, f"Profile {profile_text!r} is not served")
+            return
+        try:
+            data = self.server.pool.take(profile)
+        except Exception as e:
+            self.send_error(500, f"Maze generation failed: {e}")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.silent:
+            super().log_message(format, *args)
+
+
+def serve(args):
+    pool = MazePool(args.profile, args.stock, args.workers)
+    server = ThreadingHTTPServer((args.host, args.port), MazeRequestHandler)
+    server.pool = pool
+    server.silent = bool(args.silent)
+    if not args.silent:
+        print(f"Serving mazes on http://{args.host}:{args.port}/maze")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+
+
+def fetch_maze(host: str, port: int, profile: str) -> Tuple[Maze, List[int]]:
+    query = urlencode({"profile": profile})
+    with urlopen(f"http://{host}:{port}/maze?{query}") as response:
+        return Maze.decode(response.read())
+
+
+def fetch(args):
+    try:
+        maze, longest_path = fetch_maze(args.host, args.port, args.profile)
+    except HTTPError as e:
+        print(f"Server error {e.code}: {e.reason}", file=sys.stderr)
+        sys.exit(1)
+    except URLError as e:
+        print(
+            f"Cannot reach http://{args.host}:{args.port}: {e.reason}", file=sys.stderr
+        )
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Invalid maze received: {e}", file=sys.stderr)
+        sys.exit(1)
+    maze.display_maze_3d()
+    if not longest_path:
+        maze.out("No path found between dead ends.")
+        return
+    maze.out(
+        f"\nLongest path found between "
+        f"dead ends {longest_path[0]} and {longest_path[-1]}, "
+        f"path: {' -> '.join(map(str, longest_path))}, "
+        f"length: {len(longest_path)}"
+    )
+
+
+def parse_service_arguments(command: str, argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog=f"{PurePath(sys.argv[0]).name} {command}",
+        description=(
+            "Serve pre-generated mazes over localhost HTTP"
+            if command == "serve"
+            else "Fetch one maze from a running server and display it"
+        ),
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host")
+    parser.add_argument("--port", type=int, default=8642, help="Port")
+    if command == "serve":
+        parser.add_argument(
+            "-p",
+            "--profile",
+            type=parse_profile,
+            action="append",
+            required=True,
+            help="Maze profile to pre-generate, e.g. 20x20x3 or 20x20x3:e=2,u=0.5",
+        )
+        parser.add_argument(
+            "--stock", type=int, default=8, help="Mazes kept ready per profile"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes",
+        )
+        parser.add_argument("-s", "--silent", type=int, default=0, help="Silent mode")
+    else:
+        parser.add_argument(
+            "-p", "--profile", type=str, required=True, help="Maze profile"
+        )
+    return parser.parse_args(argv)
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Generate a 3D maze")
     parser.add_argument("-x", type=int, required=True, help="X dimension of the maze")
@@ -396,7 +981,11 @@ def parse_arguments():
     return parser.parse_args()
 
 
-if __name__ == "__main__":
+if __name__ == "__main__" and sys.argv[1:2] == ["serve"]:
+    serve(parse_service_arguments("serve", sys.argv[2:]))
+elif __name__ == "__main__" and sys.argv[1:2] == ["fetch"]:
+    fetch(parse_service_arguments("fetch", sys.argv[2:]))
+elif __name__ == "__main__":
     args = parse_arguments()
     g_direction_weights = {
         "e": args.weight_e,
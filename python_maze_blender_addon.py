@@ -23,6 +23,14 @@ bl_info = {
     "category": "Add Mesh",
 }
 
+# Bit of each direction in Maze.Cell.opening_mask()
+MASK_BITS = {direction: 1 << bit for bit, direction in enumerate("ewsnud")}
+MASK_ATTRIBUTE = "maze_mask"
+OPEN_TOP_ATTRIBUTE = "maze_open_top"
+# Custom property tagging module collections and node groups with the
+# (wall thickness, spacing) they were built for, so they can be reused
+MODULES_KEY_PROPERTY = "maze_modules_key"
+
 
 class MAZE_OT_generator_popup(bpy.types.Operator):
     bl_idname = "mesh.generate_maze_popup"
@@ -38,6 +46,19 @@ class MAZE_OT_generator_popup(bpy.types.Operator):
     spacing: bpy.props.FloatProperty(
         name="Cell Spacing", default=1.0, min=0.1, max=10.0
     )
+    output_mode: bpy.props.EnumProperty(
+        name="Output",
+        items=[
+            ("MESH", "Mesh", "One mesh with unique geometry for every cell"),
+            (
+                "INSTANCES",
+                "Instances",
+                "One vertex per cell, instancing shared wall modules "
+                "with geometry nodes (much lighter for huge mazes)",
+            ),
+        ],
+        default="MESH",
+    )
 
     def _out_verbose(self, content):
         if self._output_file:
@@ -54,6 +75,7 @@ class MAZE_OT_generator_popup(bpy.types.Operator):
             self.z_size,
             self.wall_thickness,
             self.spacing,
+            self.output_mode,
         )
         return {"FINISHED"}
 
@@ -72,13 +94,28 @@ class MAZE_OT_generator_popup(bpy.types.Operator):
         layout.prop(self, "z_size")
         layout.prop(self, "wall_thickness")
         layout.prop(self, "spacing")
+        layout.prop(self, "output_mode")
 
     @staticmethod
-    def generate_maze(context, x_size, y_size, z_size, wall_thickness, spacing):
+    def generate_maze(
+        context,
+        x_size,
+        y_size,
+        z_size,
+        wall_thickness,
+        spacing,
+        output_mode="MESH",
+    ):
         maze = Maze(sizes=[x_size, y_size, z_size], silent=False)
         maze.generate()
         maze.display_maze_3d()
 
+        if output_mode == "INSTANCES":
+            MAZE_OT_generator_popup.generate_maze_instances(
+                context, maze, x_size, y_size, z_size, wall_thickness, spacing
+            )
+            return
+
         vertices = []
         faces = []
 
@@ -200,6 +237,208 @@ class MAZE_OT_generator_popup(bpy.types.Operator):
         bpy.ops.mesh.remove_doubles(threshold=0.0001)
         bpy.ops.object.mode_set(mode="OBJECT")
 
+    @staticmethod
+    def generate_maze_instances(
+        context, maze, x_size, y_size, z_size, wall_thickness, spacing
+    ):
+        # One vertex per cell carrying its opening mask: the walls come from
+        # the 64 shared modules, picked by geometry nodes at render time.
+        step = wall_thickness + spacing
+        centers = []
+        masks = []
+        open_tops = []
+        for idx_z in range(z_size):
+            for idx_y in range(y_size):
+                for idx_x in range(x_size):
+                    cell_id = idx_x + idx_y * x_size + idx_z * x_size * y_size
+                    centers.append((idx_x * step, -idx_y * step, idx_z * step))
+                    masks.append(maze.get_cell(cell_id).opening_mask())
+                    # Same as the mesh mode: no ceiling on the top layer
+                    open_tops.append(idx_z == z_size - 1)
+
+        mesh = bpy.data.meshes.new("Maze")
+        mesh.from_pydata(centers, [], [])
+        attribute = mesh.attributes.new(name=MASK_ATTRIBUTE, type="INT", domain="POINT")
+        attribute.data.foreach_set("value", masks)
+        attribute = mesh.attributes.new(
+            name=OPEN_TOP_ATTRIBUTE, type="BOOLEAN", domain="POINT"
+        )
+        attribute.data.foreach_set("value", open_tops)
+        mesh.update()
+
+        obj = bpy.data.objects.new("Maze", mesh)
+        context.collection.objects.link(obj)
+        modifier = obj.modifiers.new("Maze Modules", "NODES")
+        modifier.node_group = MAZE_OT_generator_popup.get_instance_node_group(
+            context, wall_thickness, spacing
+        )
+        context.view_layer.objects.active = obj
+
+    @staticmethod
+    def get_instance_node_group(context, wall_thickness, spacing):
+        # Modules and node group are shared by every maze built with the
+        # same wall thickness and spacing; only the first one creates them.
+        key = f"{wall_thickness:.4f}/{spacing:.4f}"
+        for tree in bpy.data.node_groups:
+            if tree.get(MODULES_KEY_PROPERTY) == key:
+                return tree
+        modules = next(
+            (
+                collection
+                for collection in bpy.data.collections
+                if collection.get(MODULES_KEY_PROPERTY) == key
+            ),
+            None,
+        )
+        if modules is None:
+            modules = MAZE_OT_generator_popup.create_wall_modules(
+                context, wall_thickness, spacing
+            )
+            modules[MODULES_KEY_PROPERTY] = key
+        tree = MAZE_OT_generator_popup.create_instance_node_group(modules)
+        tree[MODULES_KEY_PROPERTY] = key
+        return tree
+
+    @staticmethod
+    def create_wall_modules(context, wall_thickness, spacing):
+        # Modules are named by mask so that "Separate Children" in the
+        # Collection Info node (sorted by name) yields index == mask.
+        modules = bpy.data.collections.new(
+            f"Maze Modules {wall_thickness:g} x {spacing:g}"
+        )
+        context.scene.collection.children.link(modules)
+        for mask in range(64):
+            mesh = MAZE_OT_generator_popup.wall_module_mesh(
+                mask, wall_thickness, spacing
+            )
+            modules.objects.link(bpy.data.objects.new(mesh.name, mesh))
+        # Excluded from the view layer: only visible through the instances
+        context.view_layer.layer_collection.children[modules.name].exclude = True
+        return modules
+
+    @staticmethod
+    def wall_module_mesh(mask, wall_thickness, spacing):
+        # Same faces as the mesh mode, for a single cell centered on origin
+        s2 = spacing / 2
+        g = s2 + wall_thickness  # distance to the neighbor cell's faces
+        vertices = [
+            (-s2, -s2, -s2),
+            (s2, -s2, -s2),
+            (s2, s2, -s2),
+            (-s2, s2, -s2),
+            (-s2, -s2, s2),
+            (s2, -s2, s2),
+            (s2, s2, s2),
+            (-s2, s2, s2),
+            # 8-9: east neighbor, 10-11: north neighbor, 12-15: cell below
+            (g, -s2, -s2),
+            (g, s2, -s2),
+            (s2, g, -s2),
+            (-s2, g, -s2),
+            (-s2, -s2, -g),
+            (s2, -s2, -g),
+            (s2, s2, -g),
+            (-s2, s2, -g),
+        ]
+        faces = []
+        if mask & MASK_BITS["n"]:
+            faces.append([2, 10, 11, 3])
+        else:
+            faces.append([3, 2, 6, 7])
+        if mask & MASK_BITS["e"]:
+            faces.append([1, 8, 9, 2])
+        else:
+            faces.append([1, 2, 6, 5])
+        if not mask & MASK_BITS["s"]:
+            faces.append([1, 0, 4, 5])
+        if not mask & MASK_BITS["w"]:
+            faces.append([0, 3, 7, 4])
+        if not mask & MASK_BITS["u"]:
+            faces.append([4, 5, 6, 7])
+        if mask & MASK_BITS["d"]:
+            faces.append([3, 2, 14, 15])
+            faces.append([1, 2, 14, 13])
+            faces.append([0, 1, 13, 12])
+            faces.append([0, 3, 15, 12])
+        else:
+            faces.append([0, 1, 2, 3])
+
+        # Keep only the vertices this module uses
+        used = sorted({index for face in faces for index in face})
+        remap = {index: new_index for new_index, index in enumerate(used)}
+        mesh = bpy.data.meshes.new(f"MazeModule_{mask:02d}")
+        mesh.from_pydata(
+            [vertices[index] for index in used],
+            [],
+            [[remap[index] for index in face] for face in faces],
+        )
+        mesh.update()
+        return mesh
+
+    @staticmethod
+    def create_instance_node_group(modules):
+        tree = bpy.data.node_groups.new("Maze Modules", "GeometryNodeTree")
+        tree.interface.new_socket(
+            name="Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
+        )
+        tree.interface.new_socket(
+            name="Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
+        )
+        group_input = tree.nodes.new("NodeGroupInput")
+        group_output = tree.nodes.new("NodeGroupOutput")
+
+        collection_info = tree.nodes.new("GeometryNodeCollectionInfo")
+        collection_info.inputs["Collection"].default_value = modules
+        collection_info.inputs["Separate Children"].default_value = True
+        collection_info.inputs["Reset Children"].default_value = True
+
+        mask = tree.nodes.new("GeometryNodeInputNamedAttribute")
+        mask.data_type = "INT"
+        mask.inputs["Name"].default_value = MASK_ATTRIBUTE
+
+        open_top = tree.nodes.new("GeometryNodeInputNamedAttribute")
+        open_top.data_type = "BOOLEAN"
+        open_top.inputs["Name"].default_value = OPEN_TOP_ATTRIBUTE
+
+        # Open-top cells use the module with the "u" bit set, which only
+        # drops the ceiling (top layer cells never have an up link).
+        add_up = tree.nodes.new("ShaderNodeMath")
+        add_up.operation = "ADD"
+        add_up.inputs[1].default_value = MASK_BITS["u"]
+
+        module_index = tree.nodes.new("GeometryNodeSwitch")
+        module_index.input_type = "INT"
+
+        instance_on_points = tree.nodes.new("GeometryNodeInstanceOnPoints")
+        instance_on_points.inputs["Pick Instance"].default_value = True
+
+        tree.links.new(
+            group_input.outputs["Geometry"], instance_on_points.inputs["Points"]
+        )
+        tree.links.new(
+            collection_info.outputs["Instances"],
+            instance_on_points.inputs["Instance"],
+        )
+        tree.links.new(mask.outputs["Attribute"], add_up.inputs[0])
+        tree.links.new(mask.outputs["Attribute"], module_index.inputs["False"])
+        tree.links.new(add_up.outputs["Value"], module_index.inputs["True"])
+        tree.links.new(open_top.outputs["Attribute"], module_index.inputs["Switch"])
+        tree.links.new(
+            module_index.outputs["Output"], instance_on_points.inputs["Instance Index"]
+        )
+        tree.links.new(
+            instance_on_points.outputs["Instances"], group_output.inputs["Geometry"]
+        )
+
+        group_input.location = (-400, 0)
+        collection_info.location = (-400, -150)
+        mask.location = (-600, -350)
+        open_top.location = (-600, -550)
+        add_up.location = (-400, -350)
+        module_index.location = (-200, -350)
+        group_output.location = (300, 0)
+        return tree
+
 
 class MAZE_PT_generator_panel(bpy.types.Panel):
     bl_label = "Maze Generator"
@@ -0,0 +1,234 @@
+import os
+import random
+import signal
+import threading
+import time
+import unittest
+from collections import deque
+from http.server import ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from python_maze import Maze, MazePool, MazeRequestHandler, fetch_maze, parse_profile
+
+
+def bfs_distances(maze: Maze, source: int) -> dict:
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        current_cell = queue.popleft()
+        for neighbor_cell in maze.get_cell(current_cell).links:
+            if neighbor_cell not in distances:
+                distances[neighbor_cell] = distances[current_cell] + 1
+                queue.append(neighbor_cell)
+    return distances
+
+
+def random_box(sizes):
+    box_min, box_max = [], []
+    for size in sizes:
+        low, high = sorted(random.randrange(size) for _ in range(2))
+        box_min.append(low)
+        box_max.append(high)
+    return box_min, box_max
+
+
+class MazeEditTest(unittest.TestCase):
+    sizes = [8, 7, 3]
+
+    def new_maze(self, seed: int) -> Maze:
+        random.seed(seed)
+        maze = Maze(sizes=self.sizes, silent=True)
+        maze.generate()
+        return maze
+
+    def assert_links_are_walls(self, maze: Maze):
+        for cell_id, cell in maze.cells.items():
+            for neighbor_id in cell.links:
+                self.assertIn(neighbor_id, cell.neighbors.values(), (cell_id, cell))
+                self.assertIn(cell_id, maze.get_cell(neighbor_id).links)
+
+    def assert_spanning_tree(self, maze: Maze):
+        self.assert_links_are_walls(maze)
+        links = sum(len(cell.links) for cell in maze.cells.values()) // 2
+        self.assertEqual(links, maze.total_cells - 1)
+        self.assertEqual(len(bfs_distances(maze, 0)), maze.total_cells)
+
+    def assert_distances_up_to_date(self, maze: Maze, sources):
+        for source in sources:
+            self.assertEqual(maze.distances_from(source), bfs_distances(maze, source))
+
+    def test_regenerate_region_keeps_perfect_maze(self):
+        for seed in range(200):
+            maze = self.new_maze(seed)
+            sources = random.sample(range(maze.total_cells), 4)
+            for source in sources:
+                maze.distances_from(source)
+            maze.regenerate_region(*random_box(self.sizes))
+            self.assert_spanning_tree(maze)
+            self.assert_distances_up_to_date(maze, sources)
+
+    def test_regenerate_whole_maze(self):
+        maze = self.new_maze(0)
+        maze.regenerate_region([0, 0, 0], [size - 1 for size in self.sizes])
+        self.assert_spanning_tree(maze)
+
+    def test_regenerate_region_rejects_invalid_box(self):
+        maze = self.new_maze(0)
+        with self.assertRaises(ValueError):
+            maze.regenerate_region([0, 0, 0], [8, 0, 0])
+        with self.assertRaises(ValueError):
+            maze.regenerate_region([2, 0, 0], [1, 0, 0])
+
+    def test_braid(self):
+        for seed in range(50):
+            maze = self.new_maze(seed)
+            sources = random.sample(range(maze.total_cells), 4)
+            for source in sources:
+                maze.distances_from(source)
+            dead_ends = len(maze.find_dead_ends())
+            removed = maze.braid(0.5)
+            self.assertEqual(len(maze.find_dead_ends()), dead_ends - removed)
+            self.assert_links_are_walls(maze)
+            self.assert_distances_up_to_date(maze, sources)
+            # Regenerating after braiding removes loops inside the box only
+            maze.regenerate_region(*random_box(self.sizes))
+            self.assert_links_are_walls(maze)
+            self.assertEqual(len(bfs_distances(maze, 0)), maze.total_cells)
+            self.assert_distances_up_to_date(maze, sources)
+
+    def test_edits_apply_links_in_one_batch(self):
+        maze = self.new_maze(0)
+        maze.longest_path()
+        with mock.patch.object(maze, "_add_links", wraps=maze._add_links) as add:
+            self.assertGreater(maze.braid(0.5), 1)
+        add.assert_called_once()
+        with mock.patch.object(maze, "_add_links", wraps=maze._add_links) as add:
+            maze.regenerate_region([0, 0, 0], [7, 6, 1])
+        add.assert_called_once()
+
+    def test_longest_path_matches_all_pairs_search(self):
+        for seed in range(20):
+            maze = self.new_maze(seed)
+            self.assertEqual(
+                len(maze.longest_path()), len(maze.find_longest_dead_end_path())
+            )
+
+
+class MazeEncodingTest(unittest.TestCase):
+    def test_round_trip(self):
+        random.seed(0)
+        maze = Maze(sizes=[6, 5, 3], silent=True)
+        maze.generate()
+        data = maze.encode(maze.longest_path())
+        decoded, path = Maze.decode(data, silent=True)
+        self.assertEqual(decoded.dimensions_sizes, maze.dimensions_sizes)
+        self.assertEqual(path, maze.longest_path())
+        for cell_id in range(maze.total_cells):
+            self.assertEqual(
+                decoded.get_cell(cell_id).links, maze.get_cell(cell_id).links
+            )
+
+    def test_invalid_data(self):
+        random.seed(0)
+        maze = Maze(sizes=[3, 3, 2], silent=True)
+        maze.generate()
+        data = maze.encode(maze.longest_path())
+        for length in (0, 5, 10, 20, len(data) - 1):
+            with self.assertRaises(ValueError):
+                Maze.decode(data[:length], silent=True)
+        with self.assertRaises(ValueError):
+            Maze.decode(data + b"\0", silent=True)
+        with self.assertRaises(ValueError):
+            Maze.decode(b"NOPE" + data[4:], silent=True)
+
+
+class MazePoolTest(unittest.TestCase):
+    profile = parse_profile("4x4x2")
+
+    def wait_for_stock(self, pool: MazePool, stock: int):
+        deadline = time.monotonic() + 30
+        while pool.available(self.profile) < stock:
+            self.assertLess(time.monotonic(), deadline, "pool never refilled")
+            time.sleep(0.05)
+
+    def test_drained_pool_waits_for_workers(self):
+        pool = MazePool([self.profile], stock=1, workers=1)
+        self.addCleanup(pool.shutdown)
+        self.wait_for_stock(pool, 1)
+        with mock.patch.object(pool, "_generate_locally") as generate_locally:
+            for _ in range(5):
+                Maze.decode(pool.take(self.profile), silent=True)
+        generate_locally.assert_not_called()
+        self.wait_for_stock(pool, 1)
+
+    def test_rebuilds_stock_after_crash_without_requests(self):
+        profile = parse_profile("30x30x3")
+        pool = MazePool([profile], stock=2, workers=1)
+        self.addCleanup(pool.shutdown)
+        deadline = time.monotonic() + 60
+        while pool.available(profile) < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+        pool.take(profile)
+        pool.take(profile)
+        # Both refills are pending in the single worker: kill it
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        while pool.available(profile) < 2:
+            self.assertLess(time.monotonic(), deadline, "pool never refilled")
+            time.sleep(0.05)
+
+    def test_refills_after_worker_dies(self):
+        pool = MazePool([self.profile], stock=2, workers=1)
+        self.addCleanup(pool.shutdown)
+        self.wait_for_stock(pool, 2)
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        time.sleep(0.5)
+        for _ in range(3):
+            Maze.decode(pool.take(self.profile), silent=True)
+        self.wait_for_stock(pool, 2)
+
+
+class MazeServerTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = MazePool([parse_profile("4x3x2:e=2")], stock=2, workers=1)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MazeRequestHandler)
+        self.server.pool = self.pool
+        self.server.silent = True
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.pool.shutdown()
+
+    def assert_http_error(self, url: str, code: int):
+        with self.assertRaises(HTTPError) as context:
+            urlopen(f"http://127.0.0.1:{self.port}{url}")
+        self.assertEqual(context.exception.code, code)
+
+    def test_fetch_maze(self):
+        maze, path = fetch_maze("127.0.0.1", self.port, "4x3x2:e=2")
+        self.assertEqual(maze.dimensions_sizes, [4, 3, 2])
+        links = sum(len(cell.links) for cell in maze.cells.values()) // 2
+        self.assertEqual(links, maze.total_cells - 1)
+        self.assertEqual(len(path), len(maze.longest_path()))
+        self.assertIn(path[0], maze.find_dead_ends())
+        self.assertIn(path[-1], maze.find_dead_ends())
+        for cell_id, next_cell_id in zip(path, path[1:]):
+            self.assertIn(next_cell_id, maze.get_cell(cell_id).links)
+
+    def test_errors(self):
+        self.assert_http_error("/maze?profile=4x3", 400)
+        self.assert_http_error("/maze?profile=4x3x2:q=1", 400)
+        self.assert_http_error("/maze?profile=4x3x2", 404)
+        self.assert_http_error("/other?profile=4x3x2:e=2", 404)
+
+
+if __name__ == "__main__":
+    unittest.main()